@@ -3,22 +3,65 @@
 import click
 import yaml
 import json
+import re
+import orjson
 import os
+import time
+import hashlib
+import asyncio
+import sys
+import subprocess
+import atexit
+import tempfile
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from jinja2 import Template
-import pdfkit
-import openai
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from dotenv import load_dotenv
-import requests
-
-config = pdfkit.configuration(wkhtmltopdf=r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe')
 
+# openai, pdfkit and requests are imported where they're used, so --help,
+# HTML-only runs and the other backends don't pay for loading them
 
 # Load environment variables
 load_dotenv()
 
-def get_instructions():
-    return """
+# Cached LLM responses expire after 30 days
+CACHE_MAX_AGE = 30 * 86400
+
+# Models served through the OpenAI API, fastest and cheapest first
+OPENAI_MODELS = ('gpt-4o-mini', 'gpt-4.1-mini', 'gpt-4o', 'gpt-4.1', 'gpt-4')
+
+# Common words ignored when matching profile entries against a job description
+STOPWORDS = {
+    'and', 'the', 'for', 'with', 'from', 'into', 'that', 'this', 'our', 'you', 'your',
+    'are', 'will', 'have', 'has', 'using', 'use', 'of', 'to', 'in', 'on', 'at', 'by',
+    'an', 'or', 'as', 'is', 'be', 'we', 'all', 'new'
+}
+
+# Compiled templates are cached on disk so later runs skip parsing them
+JINJA_CACHE_DIR = '.jinja_cache'
+
+# Page margin shared by every PDF backend
+PDF_MARGIN = '0.75in'
+
+# A tailored resume is typically 600-900 completion tokens
+MAX_TOKENS = 1200
+
+# Most completion tokens a single request may ask for. gpt-4 and the local
+# model share an 8k context between prompt and answer, so they get far less.
+MAX_COMPLETION_TOKENS = {
+    'gpt-4o-mini': 16384,
+    'gpt-4o': 16384,
+    'gpt-4.1-mini': 32768,
+    'gpt-4.1': 32768,
+    'gpt-4': 2400,
+    'local-gpt-oss': 2400
+}
+
+SYSTEM_PROMPT = "You are an expert resume writer. Always respond with valid JSON only."
+
+INSTRUCTIONS = """
     - Only include the most relevant experiences (max 4)
     - Prioritize skills that match the job requirements (min 5, max 7)
     - Rewrite achievements to use keywords from the job description
@@ -38,108 +81,375 @@ def load_user_profile(profile_path):
         if profile_path.endswith('.yaml') or profile_path.endswith('.yml'):
             return yaml.safe_load(f)
         else:
-            return json.load(f)
+            return orjson.loads(f.read())
 
 def load_job_description(job_path):
     with open(job_path, 'r', encoding='utf-8') as f:
         return f.read().strip()
 
-def get_json_structure(template):
+@lru_cache(maxsize=1)
+def load_structures():
     structures_file = 'resume_structures.json'
     
     if not os.path.exists(structures_file):
         raise FileNotFoundError(f"Structures file '{structures_file}' not found")
     
     try:
-        with open(structures_file, 'r') as f:
-            structures = json.load(f)
-        
-        structure = structures.get(template, None)
-        if structure is None:
-            return None
-            
-        # Convert the structure back to a formatted JSON string
-        return json.dumps(structure, indent=4)
+        with open(structures_file, 'rb') as f:
+            return orjson.loads(f.read())
     
     except json.JSONDecodeError:
         raise ValueError(f"Invalid JSON in '{structures_file}'")
     except Exception as e:
         raise Exception(f"Error reading structures file: {e}")
 
-def prompt_llm(prompt, model):
+def merge_structures(base, other):
+    # Union of both structures, so one response has every field either template uses
+    if isinstance(base, dict) and isinstance(other, dict):
+        merged = dict(base)
+        for key, value in other.items():
+            merged[key] = merge_structures(base[key], value) if key in base else value
+        return merged
+    if isinstance(base, list) and isinstance(other, list) and base and other:
+        return [merge_structures(base[0], other[0])] + base[1:]
+    return base
+
+@lru_cache(maxsize=8)
+def get_json_structure(*templates):
+    structure = None
+    for template in templates:
+        template_structure = load_structures().get(template, None)
+        if template_structure is None:
+            return None
+        structure = template_structure if structure is None else merge_structures(structure, template_structure)
+        
+    # Convert the structure back to a formatted JSON string
+    return json.dumps(structure, indent=4)
+
+def get_openai_client(asynchronous=False):
+    import openai
+
+    openai.api_key = os.getenv("OPENAI_API_KEY")
+    if not openai.api_key:
+        raise ValueError("Please set OPENAI_API_KEY environment variable")
+    return openai.AsyncOpenAI() if asynchronous else openai.OpenAI()
+
+def get_openai_request(prompt, model, max_tokens=MAX_TOKENS):
+    request = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": max_tokens,
+        "temperature": 0.3
+    }
+
+    # JSON mode guarantees a parseable object, so no markdown fences to strip.
+    # The original gpt-4 doesn't support it.
+    if model != 'gpt-4':
+        request["response_format"] = {"type": "json_object"}
+
+    return request
+
+def prompt_llm(prompt, model, max_tokens=MAX_TOKENS, on_token=None):
     
-    # GPT-4 API Call
-    if model == 'gpt-4':
+    # OpenAI API Call
+    if model in OPENAI_MODELS:
         
         # Configure OpenAI
-        openai.api_key = os.getenv("OPENAI_API_KEY")
-        if not openai.api_key:
-            raise ValueError("Please set OPENAI_API_KEY environment variable")
-        client = openai.OpenAI()
-
-        # Call GPT-4
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are an expert resume writer. Always respond with valid JSON only."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=2000,
-            temperature=0.3
-        )
-        return response.choices[0].message.content
+        client = get_openai_client()
+
+        # Call OpenAI, streaming so the caller can report progress while it generates
+        stream = client.chat.completions.create(**get_openai_request(prompt, model, max_tokens), stream=True)
+        chunks = []
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                chunks.append(delta)
+                if on_token:
+                    on_token(delta)
+        return "".join(chunks)
     
     # GPT-OSS Local LLM via Ollama
     elif model == 'local-gpt-oss':
         
-        # Call Ollama
-        response = requests.post(
+        # Call Ollama, keeping the model loaded between runs and forcing JSON output.
+        # num_predict is left uncapped since gpt-oss spends tokens on reasoning first.
+        response = get_ollama_session().post(
             "http://localhost:11434/api/generate",
             json={
                 "model": "gpt-oss:20b",
                 "prompt": prompt,
-                "stream": False
-            }
+                "stream": False,
+                "format": "json",
+                "keep_alive": "30m",
+                "options": {
+                    "temperature": 0.3,
+                    "num_ctx": 8192
+                }
+            },
+            timeout=600
         )
+        response.raise_for_status()
         return response.json()["response"]
+
+    raise ValueError(f"Unknown model '{model}'")
     
+@lru_cache(maxsize=1)
+def get_ollama_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    # Reuse one HTTP connection to Ollama across requests, retrying briefly
+    # on refused connections and 5xx while the server is still starting.
+    # Read errors and timeouts are never retried: the generation may already
+    # be running, and resending it would just run it again.
+    retry = Retry(
+        total=2,
+        connect=2,
+        read=0,
+        status=2,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=None
+    )
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(max_retries=retry))
+    return session
+
+def get_cache_key(prompt, model):
+    return hashlib.sha256((model + prompt).encode('utf-8')).hexdigest()
+
+def load_cached_response(cache_dir, key, max_age=CACHE_MAX_AGE):
+    cache_path = Path(cache_dir) / f"{key}.json"
+    if not cache_path.exists():
+        return None
+
+    # Expired entries are treated as misses
+    if time.time() - cache_path.stat().st_mtime > max_age:
+        return None
+
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)["response"]
+    except (json.JSONDecodeError, KeyError, OSError):
+        return None
+
+def save_cached_response(cache_dir, key, response):
+    # A missing response must not be cached, or it would be served as a hit
+    if response is None:
+        return
+
+    cache_path = Path(cache_dir) / f"{key}.json"
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write to a temp file first so a crash never leaves a half-written entry
+    tmp_path = cache_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"response": response}, f)
+    os.replace(tmp_path, cache_path)
+
+def prompt_llm_cached(prompt, model, cache_dir=None, on_token=None):
+    if cache_dir is None:
+        return prompt_llm(prompt, model, on_token=on_token), False
+
+    key = get_cache_key(prompt, model)
+    response = load_cached_response(cache_dir, key)
+    if response is not None:
+        return response, True
+
+    response = prompt_llm(prompt, model, on_token=on_token)
+    return response, False
+
+def submit_openai_batch(prompts, model, poll_interval=30, verbose=False):
+    client = get_openai_client()
+
+    # Build the JSONL batch file, one chat completion request per prompt
+    lines = []
+    for custom_id, prompt in prompts.items():
+        lines.append(json.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": get_openai_request(prompt, model)
+        }))
+    batch_input = "\n".join(lines).encode('utf-8')
+
+    # Upload and create the batch job
+    input_file = client.files.create(file=("batch_input.jsonl", batch_input), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+
+    # Poll until the batch reaches a terminal state
+    while batch.status not in ('completed', 'failed', 'expired', 'cancelled'):
+        if verbose:
+            counts = batch.request_counts
+            done = counts.completed if counts else 0
+            click.echo(f"⏳ Batch {batch.id} is {batch.status} ({done}/{len(prompts)} done)")
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+
+    if batch.status != 'completed':
+        raise RuntimeError(f"Batch {batch.id} ended with status '{batch.status}'")
+
+    # Download the results and map them back to their custom ids
+    responses = {}
+    if batch.output_file_id:
+        output = client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            result = orjson.loads(line)
+            body = (result.get("response") or {}).get("body") or {}
+            choices = body.get("choices") or []
+            if choices:
+                responses[result["custom_id"]] = choices[0]["message"]["content"]
+    return responses
+
+async def prompt_openai_concurrent(prompts, model, max_concurrency):
+    client = get_openai_client(asynchronous=True)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def request(custom_id, prompt):
+        async with semaphore:
+            try:
+                response = await client.chat.completions.create(**get_openai_request(prompt, model))
+                return custom_id, response.choices[0].message.content
+            except Exception as e:
+                print(f"Error requesting LLM for {custom_id}: {e}")
+                return custom_id, None
+
+    results = await asyncio.gather(*(request(custom_id, prompt) for custom_id, prompt in prompts.items()))
+    return {custom_id: response for custom_id, response in results if response is not None}
+
+def prompt_llm_many(prompts, model, mode='batch-api', max_concurrency=4, poll_interval=30, verbose=False):
+    if not prompts:
+        return {}
+
+    if model in OPENAI_MODELS:
+        if mode == 'batch-api':
+            return submit_openai_batch(prompts, model, poll_interval, verbose)
+        return asyncio.run(prompt_openai_concurrent(prompts, model, max_concurrency))
+
+    # Local models have no batch endpoint, so prompt them one at a time
+    responses = {}
+    for custom_id, prompt in prompts.items():
+        try:
+            responses[custom_id] = prompt_llm(prompt, model)
+        except Exception as e:
+            print(f"Error requesting LLM for {custom_id}: {e}")
+    return responses
+
 def clean_response(response): 
 
     # Parse the JSON response from AI
     if isinstance(response, str):
-        # Clean the response in case there's extra text around the JSON
-        response = response.strip()
-        if response.startswith('```json'):
-            response = response[7:]  # Remove ```json
-        if response.endswith('```'):
-            response = response[:-3]  # Remove ```
-        
-        cleaned_response = json.loads(response)
+        try:
+            cleaned_response = orjson.loads(response)
+        except orjson.JSONDecodeError:
+            # Pull the outermost object out of any markdown fences or prose around it
+            match = re.search(r'\{.*\}', response, re.S)
+            if match is None:
+                raise
+            cleaned_response = orjson.loads(match.group(0))
     else:
         cleaned_response = response
 
+    # Anything but an object (None, a list, a bare string) can't be rendered
+    if not isinstance(cleaned_response, dict):
+        raise ValueError(f"Expected a JSON object from the LLM, got {type(cleaned_response).__name__}")
+
     return cleaned_response
 
 
+def tokenize(text):
+    # Keep symbols common in tech names (C++, C#, Node.js) and drop trailing punctuation
+    tokens = {token.rstrip('.') for token in re.findall(r"[a-z0-9][a-z0-9+#.]*", text.lower())}
+    return {token for token in tokens if len(token) > 1 and token not in STOPWORDS}
+
+def profile_item_text(item):
+    if isinstance(item, dict):
+        return " ".join(profile_item_text(value) for value in item.values())
+    if isinstance(item, list):
+        return " ".join(profile_item_text(value) for value in item)
+    return str(item)
+
+def top_k_relevant(items, job_tokens, k):
+    if not isinstance(items, list) or len(items) <= k:
+        return items
+
+    # Score by how many job description words each item mentions, then keep
+    # the best k in their original order
+    scores = [len(tokenize(profile_item_text(item)) & job_tokens) for item in items]
+    ranked = sorted(range(len(items)), key=lambda i: scores[i], reverse=True)
+    return [items[i] for i in sorted(ranked[:k])]
+
+def prefilter_profile(profile, job_description, top_k_exp=8, top_k_skill=30, top_k_proj=10):
+    # Drop the least relevant entries before they reach the prompt; the LLM
+    # still makes the final selection from what's left
+    job_tokens = tokenize(job_description)
+    trimmed = dict(profile)
+    for key, k in (('experience', top_k_exp), ('skills', top_k_skill), ('projects', top_k_proj)):
+        if key in trimmed:
+            trimmed[key] = top_k_relevant(trimmed[key], job_tokens, k)
+    return trimmed
+
+def profile_to_json(user_profile):
+    # YAML profiles can contain dates and non-string keys, which orjson handles natively
+    return orjson.dumps(user_profile, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
 def generate_prompt(user_profile, job_description, json_structure):
 
-    prompt = f"""
-    You are an expert resume writer. Given a user's profile and a job description, create a tailored resume by selecting and reordering the most relevant information.
-    Do not use all the information in the user's profile. If the skills, experience, or education do not pertain to the job, leave them out. Only include irrelevant information if there is not enough content.
-    USER PROFILE:
-    {json.dumps(user_profile, indent=2)}
+    return get_template_env().get_template('prompt.j2').render(
+        user_profile_json=profile_to_json(user_profile),
+        job_description=job_description,
+        json_structure=json_structure,
+        instructions=INSTRUCTIONS
+    )
 
-    JOB DESCRIPTION:
-    {job_description}
+def generate_batch_prompt(user_profile, job_descriptions, json_structure):
 
-    Please return a JSON object with the tailored resume content using this structure:
-    {json_structure}
+    return get_template_env().get_template('batch_prompt.j2').render(
+        user_profile_json=profile_to_json(user_profile),
+        job_descriptions=job_descriptions,
+        json_structure=json_structure,
+        instructions=INSTRUCTIONS
+    )
 
-    Instructions:
-    {get_instructions()}
-    """
+def split_batch_response(response):
+    results = clean_response(response).get("results", [])
+    return {int(result["id"]): result["resume"] for result in results}
+
+def prompt_llm_combined(user_profile, job_descriptions, json_structure, model):
+    # Send as many jobs per request as the model's completion limit allows, so
+    # the profile and instructions are sent once per group instead of per job
+    jobs_per_prompt = max(1, MAX_COMPLETION_TOKENS.get(model, MAX_TOKENS) // MAX_TOKENS)
+    all_ids = list(job_descriptions)
+
+    responses = {}
+    for start in range(0, len(all_ids), jobs_per_prompt):
+        custom_ids = all_ids[start:start + jobs_per_prompt]
+        prompt = generate_batch_prompt(user_profile, [job_descriptions[custom_id] for custom_id in custom_ids], json_structure)
+
+        try:
+            response = prompt_llm(prompt, model, max_tokens=MAX_TOKENS * len(custom_ids))
+            resumes = split_batch_response(response)
+        except Exception as e:
+            print(f"Error requesting LLM for {', '.join(custom_ids)}: {e}")
+            continue
 
-    return prompt
+        # Re-serialize each resume so it can be cleaned and cached like a single response
+        for i, resume in resumes.items():
+            if 0 <= i < len(custom_ids):
+                responses[custom_ids[i]] = json.dumps(resume)
+    return responses
 
 def raw_profile_to_json(profile):
     return {
@@ -153,58 +463,226 @@ def raw_profile_to_json(profile):
     }
 
 
-def generate_html_resume(resume_data, template):
+@lru_cache(maxsize=1)
+def get_template_env():
+    # One environment for resume and prompt templates. It keeps compiled
+    # templates in memory, and the bytecode cache keeps them across runs.
+    Path(JINJA_CACHE_DIR).mkdir(parents=True, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader('templates'),
+        bytecode_cache=FileSystemBytecodeCache(directory=JINJA_CACHE_DIR),
+        auto_reload=False,
+        keep_trailing_newline=True
+    )
+
+
+def load_template(template):
     template_path = Path(f"templates/{template}")
     
     if not template_path.exists():
         raise FileNotFoundError(f"Template file not found: {template_path}")
     
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template_str = f.read()
+    return get_template_env().get_template(template)
+
+
+def generate_html_resume(resume_data, template, loaded_template=None):
+    if loaded_template is None:
+        loaded_template = load_template(template)
+    return loaded_template.render(**resume_data)
+
+
+def warm_up_rendering(templates, pdf_backend='wkhtmltopdf'):
+    # Runs alongside the LLM call so template parsing and the first
+    # wkhtmltopdf launch don't add to the wait afterwards
+    loaded_templates = [load_template(template) for template in templates]
+
+    if pdf_backend == 'wkhtmltopdf':
+        try:
+            config = get_pdfkit_config()
+            if config is not None:
+                subprocess.run([config.wkhtmltopdf, '--version'], capture_output=True, timeout=30)
+        except (OSError, subprocess.SubprocessError):
+            pass
+
+    return loaded_templates
+
+
+def find_wkhtmltopdf():
+    # An explicit WKHTMLTOPDF_BIN wins, then PATH, then the default Windows install
+    wkhtmltopdf = (
+        os.environ.get("WKHTMLTOPDF_BIN")
+        or shutil.which("wkhtmltopdf")
+        or r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe'
+    )
+    return wkhtmltopdf if os.path.exists(wkhtmltopdf) else None
+
+
+@lru_cache(maxsize=1)
+def get_pdfkit_config():
+    import pdfkit
+
+    wkhtmltopdf = find_wkhtmltopdf()
+    if wkhtmltopdf is None:
+        return None
+    return pdfkit.configuration(wkhtmltopdf=wkhtmltopdf)
+
+
+def render_pdf_wkhtmltopdf(html_content, output_path):
+    import pdfkit
+
+    # Don't spawn anything if there's no binary to run
+    config = get_pdfkit_config()
+    if config is None:
+        raise FileNotFoundError("wkhtmltopdf executable not found (set WKHTMLTOPDF_BIN or add it to PATH)")
+
+    # Configure pdfkit options for better output
+    options = {
+        'page-size': 'A4',
+        'margin-top': PDF_MARGIN,
+        'margin-right': PDF_MARGIN,
+        'margin-bottom': PDF_MARGIN,
+        'margin-left': PDF_MARGIN,
+        'encoding': "UTF-8",
+        'no-outline': None,
+        'enable-local-file-access': None
+    }
     
-    template = Template(template_str)
-    return template.render(**resume_data)
+    # Render from a temp file; piping large documents over stdin is slow
+    # with some wkhtmltopdf versions
+    with tempfile.NamedTemporaryFile('w', suffix='.html', encoding='utf-8', delete=False) as f:
+        f.write(html_content)
+        html_path = f.name
+    try:
+        pdfkit.from_file(html_path, output_path, options=options, configuration=config)
+    finally:
+        os.remove(html_path)
+
+
+_PLAYWRIGHT = None
+_BROWSER = None
+
+def close_browser():
+    global _PLAYWRIGHT, _BROWSER
+    if _BROWSER is not None:
+        _BROWSER.close()
+        _PLAYWRIGHT.stop()
+        _PLAYWRIGHT = _BROWSER = None
 
+def get_browser():
+    global _PLAYWRIGHT, _BROWSER
+    if _BROWSER is None:
+        from playwright.sync_api import sync_playwright
 
-def generate_pdf(html_content, output_path):
+        # Keep one headless Chromium alive for every PDF in this process
+        _PLAYWRIGHT = sync_playwright().start()
+        _BROWSER = _PLAYWRIGHT.chromium.launch()
+        atexit.register(close_browser)
+    return _BROWSER
+
+def render_pdf_playwright(html_content, output_path):
+    page = get_browser().new_page()
     try:
-        # Configure pdfkit options for better output
-        options = {
-            'page-size': 'A4',
-            'margin-top': '0.75in',
-            'margin-right': '0.75in',
-            'margin-bottom': '0.75in',
-            'margin-left': '0.75in',
-            'encoding': "UTF-8",
-            'no-outline': None,
-            'enable-local-file-access': None
-        }
-        
-        pdfkit.from_string(html_content, output_path, options=options, configuration=config)
+        page.set_content(html_content)
+        page.pdf(
+            path=output_path,
+            format="A4",
+            margin={side: PDF_MARGIN for side in ('top', 'right', 'bottom', 'left')},
+            # Chromium drops CSS backgrounds by default; wkhtmltopdf keeps them
+            print_background=True
+        )
+    finally:
+        page.close()
+
+def render_pdf_weasyprint(html_content, output_path):
+    from weasyprint import HTML, CSS
+
+    page_style = CSS(string=f"@page {{ size: A4; margin: {PDF_MARGIN}; }}")
+    HTML(string=html_content).write_pdf(output_path, stylesheets=[page_style])
+
+
+PDF_BACKENDS = {
+    'wkhtmltopdf': render_pdf_wkhtmltopdf,
+    'playwright': render_pdf_playwright,
+    'weasyprint': render_pdf_weasyprint
+}
+
+PDF_INSTALL_HINTS = {
+    'wkhtmltopdf': [
+        "Please make sure wkhtmltopdf is installed:",
+        "Windows: Download from https://wkhtmltopdf.org/downloads.html",
+        "Mac: brew install wkhtmltopdf",
+        "Linux: sudo apt-get install wkhtmltopdf"
+    ],
+    'playwright': [
+        "Please make sure Playwright and Chromium are installed:",
+        "pip install playwright && playwright install chromium"
+    ],
+    'weasyprint': [
+        "Please make sure WeasyPrint is installed:",
+        "pip install weasyprint"
+    ]
+}
+
+
+def generate_pdf(html_content, output_path, pdf_backend='wkhtmltopdf'):
+    try:
+        PDF_BACKENDS[pdf_backend](html_content, output_path)
         return True
     except Exception as e:
-        print(f"Error generating PDF with pdfkit: {e}")
-        print("Please make sure wkhtmltopdf is installed:")
-        print("Windows: Download from https://wkhtmltopdf.org/downloads.html")
-        print("Mac: brew install wkhtmltopdf")
-        print("Linux: sudo apt-get install wkhtmltopdf")
+        print(f"Error generating PDF with {pdf_backend}: {e}")
+        for hint in PDF_INSTALL_HINTS[pdf_backend]:
+            print(hint)
         
         # Fallback: save as HTML
-        html_output = output_path.replace('.pdf', '.html')
-        with open(html_output, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        html_output = save_html(html_content, output_path)
         print(f"Saved as HTML instead: {html_output}")
         return False
 
 
-@click.command()
+def get_template_output_path(output_path, template, templates):
+    # With several templates, each resume gets the template name as a suffix
+    if len(templates) == 1:
+        return output_path
+    output = Path(output_path)
+    return str(output.with_name(f"{output.stem}-{Path(template).stem}{output.suffix}"))
+
+
+def save_html(html_content, output_path):
+    html_output = str(Path(output_path).with_suffix('.html'))
+    with open(html_output, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    return html_output
+
+
+def generate_pdfs_parallel(jobs, max_workers=None, pdf_backend='wkhtmltopdf'):
+    if not jobs:
+        return []
+
+    # Playwright's browser is bound to the thread that started it and
+    # WeasyPrint renders in-process, so only wkhtmltopdf runs in parallel
+    if pdf_backend != 'wkhtmltopdf':
+        return [generate_pdf(html_content, output_path, pdf_backend) for html_content, output_path in jobs]
+
+    # Each PDF is rendered by its own wkhtmltopdf process, so threads are
+    # enough to keep several of them running at once
+    max_workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda job: generate_pdf(*job, pdf_backend), jobs))
+
+
+@click.command(epilog="To tailor one profile to a whole directory of job descriptions, see: generate_resume.py batch --help")
 @click.option('--profile', '-p', required=True, help='Path to user profile YAML/JSON file')
 @click.option('--job', '-j', required=True, help='Path to job description text file')
 @click.option('--output', '-o', required=True, help='Output path for generated PDF resume')
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
-@click.option('--template', '-t', default='experience_template.html', help='Path to HTML template file')
-@click.option('--model', '-m', default='local-gpt-oss', help='LLM model to use')
-def main(profile, job, output, verbose, template, model):
+@click.option('--template', '-t', 'templates', multiple=True, default=['experience_template.html'], help='Path to HTML template file; repeat to render several templates from one LLM call')
+@click.option('--model', '-m', type=click.Choice(('local-gpt-oss',) + OPENAI_MODELS), default='local-gpt-oss', help='LLM model to use')
+@click.option('--format', 'output_format', type=click.Choice(['pdf', 'html', 'both']), default='pdf', help='Write a PDF, the HTML only (skips PDF rendering), or both')
+@click.option('--pdf-backend', type=click.Choice(list(PDF_BACKENDS)), default='wkhtmltopdf', help='Renderer used to produce the PDF')
+@click.option('--no-prefilter', is_flag=True, help='Send the whole profile instead of only the entries most relevant to the job')
+@click.option('--cache-dir', default='.llm_cache', help='Directory for cached LLM responses')
+@click.option('--no-cache', is_flag=True, help='Always query the LLM, ignoring cached responses')
+def main(profile, job, output, verbose, templates, model, output_format, pdf_backend, no_prefilter, cache_dir, no_cache):
     
     try:
         # Ensure output directory exists
@@ -223,26 +701,41 @@ def main(profile, job, output, verbose, template, model):
         job_description = load_job_description(job)
         
         if verbose:
-            click.echo(f"🏗️ Getting JSON structure from {template}")
-        json_structure = get_json_structure(template)
+            click.echo(f"🏗️ Getting JSON structure from {', '.join(templates)}")
+        json_structure = get_json_structure(*templates)
         if not json_structure:
-            click.echo(f"❌ Failed to get JSON structure from {template}", err=True)
+            click.echo(f"❌ Failed to get JSON structure from {', '.join(templates)}", err=True)
             return
 
+        # Load the templates in the background while waiting on the LLM
+        executor = ThreadPoolExecutor(max_workers=1)
+        warm_up = executor.submit(warm_up_rendering, templates, pdf_backend if output_format != 'html' else None)
+        executor.shutdown(wait=False)
+
         # Tailor resume with LLM
         if verbose:
             click.echo("🤖 Generating Prompt for AI...")
-        prompt = generate_prompt(user_profile, job_description, json_structure)
+        prompt_profile = user_profile if no_prefilter else prefilter_profile(user_profile, job_description)
+        prompt = generate_prompt(prompt_profile, job_description, json_structure)
         
         try:
             if verbose:
                 click.echo("🤖 Requesting LLM...")
-            ai_response = prompt_llm(prompt, model)
+            on_token = (lambda delta: click.echo(delta, nl=False, err=True)) if verbose else None
+            ai_response, cache_hit = prompt_llm_cached(prompt, model, None if no_cache else cache_dir, on_token)
             tailored_resume = clean_response(ai_response)
             
             if verbose:
+                if model in OPENAI_MODELS and not cache_hit:
+                    click.echo(err=True)
+                if cache_hit:
+                    click.echo("💾 Using cached LLM response")
                 click.echo("✅ Successfully parsed AI response")
 
+            # Only cache responses that parsed to an object, so a bad response is retried next run
+            if not no_cache and not cache_hit:
+                save_cached_response(cache_dir, get_cache_key(prompt, model), ai_response)
+
         except Exception as e:
             print(f"Error tailoring resume: {e}")
             # Fallback: return original profile in expected format
@@ -253,21 +746,148 @@ def main(profile, job, output, verbose, template, model):
         # Generate HTML
         if verbose:
             click.echo("📄 Generating HTML resume...")
-        html_content = generate_html_resume(tailored_resume, template)
-        
-        # Generate PDF
+        pdf_jobs = []
+        for template, loaded_template in zip(templates, warm_up.result()):
+            template_output = get_template_output_path(output, template, templates)
+            html_content = generate_html_resume(tailored_resume, template, loaded_template)
+            
+            if output_format in ('html', 'both'):
+                html_output = save_html(html_content, template_output)
+                click.echo(f"✨ HTML resume generated successfully: {html_output}")
+            if output_format != 'html':
+                pdf_jobs.append((html_content, template_output))
+
+        if not pdf_jobs:
+            return
+
+        # Generate PDFs, in parallel when there are several templates
         if verbose:
             click.echo("📁 Generating PDF...")
-        success = generate_pdf(html_content, output)
+        results = generate_pdfs_parallel(pdf_jobs, pdf_backend=pdf_backend)
         
-        if success:
-            click.echo(f"✨ Resume generated successfully: {output}")
-        else:
-            click.echo("❌ Failed to generate PDF", err=True)
+        for (_, template_output), success in zip(pdf_jobs, results):
+            if success:
+                click.echo(f"✨ Resume generated successfully: {template_output}")
+            else:
+                click.echo(f"❌ Failed to generate PDF: {template_output}", err=True)
             
     except Exception as e:
         click.echo(f"❌ Error: {e}", err=True)
 
 
+@click.command()
+@click.option('--profile', '-p', required=True, help='Path to user profile YAML/JSON file')
+@click.option('--jobs', '-j', required=True, help='Directory of job description text files')
+@click.option('--out', '-o', required=True, help='Output directory for generated PDF resumes')
+@click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
+@click.option('--template', '-t', default='experience_template.html', help='Path to HTML template file')
+@click.option('--model', '-m', type=click.Choice(('local-gpt-oss',) + OPENAI_MODELS), default='local-gpt-oss', help='LLM model to use')
+@click.option('--mode', type=click.Choice(['batch-api', 'concurrent', 'combined']), default='batch-api', help='Use the OpenAI Batch API (cheaper, up to 24h), concurrent requests, or one combined prompt for all jobs')
+@click.option('--max-concurrency', default=4, help='Maximum concurrent requests in concurrent mode')
+@click.option('--poll-interval', default=30, help='Seconds between Batch API status checks')
+@click.option('--max-parallelism', default=os.cpu_count() or 1, help='Maximum PDFs to render at once')
+@click.option('--format', 'output_format', type=click.Choice(['pdf', 'html', 'both']), default='pdf', help='Write a PDF, the HTML only (skips PDF rendering), or both')
+@click.option('--pdf-backend', type=click.Choice(list(PDF_BACKENDS)), default='wkhtmltopdf', help='Renderer used to produce the PDF')
+@click.option('--no-prefilter', is_flag=True, help='Send the whole profile instead of only the entries most relevant to the job')
+@click.option('--cache-dir', default='.llm_cache', help='Directory for cached LLM responses')
+@click.option('--no-cache', is_flag=True, help='Always query the LLM, ignoring cached responses')
+def batch(profile, jobs, out, verbose, template, model, mode, max_concurrency, poll_interval, max_parallelism, output_format, pdf_backend, no_prefilter, cache_dir, no_cache):
+
+    try:
+        Path(out).mkdir(parents=True, exist_ok=True)
+
+        # Load inputs
+        if verbose:
+            click.echo(f"📖 Loading user profile from {profile}")
+        user_profile = load_user_profile(profile)
+
+        job_paths = sorted(Path(jobs).glob('*.txt'))
+        if not job_paths:
+            click.echo(f"❌ No job description files found in {jobs}", err=True)
+            return
+
+        json_structure = get_json_structure(template)
+        if not json_structure:
+            click.echo(f"❌ Failed to get JSON structure from {template}", err=True)
+            return
+
+        # Build one prompt per job, keyed by the job file name
+        job_descriptions = {}
+        prompts = {}
+        for job_path in job_paths:
+            job_descriptions[job_path.stem] = load_job_description(str(job_path))
+            prompt_profile = user_profile if no_prefilter else prefilter_profile(user_profile, job_descriptions[job_path.stem])
+            prompts[job_path.stem] = generate_prompt(prompt_profile, job_descriptions[job_path.stem], json_structure)
+
+        # Serve what we can from the cache and only send the rest to the LLM
+        responses = {}
+        if not no_cache:
+            for custom_id, prompt in prompts.items():
+                cached = load_cached_response(cache_dir, get_cache_key(prompt, model))
+                if cached is not None:
+                    responses[custom_id] = cached
+        pending = {custom_id: prompt for custom_id, prompt in prompts.items() if custom_id not in responses}
+
+        if verbose:
+            click.echo(f"🤖 Requesting LLM for {len(pending)} of {len(prompts)} jobs...")
+        try:
+            if mode == 'combined' and pending:
+                pending_jobs = {custom_id: job_descriptions[custom_id] for custom_id in pending}
+                prompt_profile = user_profile if no_prefilter else prefilter_profile(user_profile, "\n".join(pending_jobs.values()))
+                fresh = prompt_llm_combined(prompt_profile, pending_jobs, json_structure, model)
+            else:
+                fresh = prompt_llm_many(pending, model, mode, max_concurrency, poll_interval, verbose)
+        except Exception as e:
+            print(f"Error requesting LLM: {e}")
+            fresh = {}
+
+        pdf_jobs = []
+        for custom_id, prompt in prompts.items():
+            output = str(Path(out) / f"{custom_id}.pdf")
+
+            try:
+                ai_response = responses.get(custom_id, fresh.get(custom_id))
+                if ai_response is None:
+                    raise ValueError("No response from LLM")
+                tailored_resume = clean_response(ai_response)
+
+                if not no_cache and custom_id in fresh:
+                    save_cached_response(cache_dir, get_cache_key(prompt, model), ai_response)
+
+            except Exception as e:
+                print(f"Error tailoring resume for {custom_id}: {e}")
+                # Fallback: return original profile in expected format
+                tailored_resume = raw_profile_to_json(user_profile)
+                if verbose:
+                    click.echo(f"⚠️ Using fallback resume format for {custom_id}")
+
+            html_content = generate_html_resume(tailored_resume, template)
+            if output_format in ('html', 'both'):
+                html_output = save_html(html_content, output)
+                click.echo(f"✨ HTML resume generated successfully: {html_output}")
+            if output_format != 'html':
+                pdf_jobs.append((html_content, output))
+
+        if not pdf_jobs:
+            return
+
+        # Render all PDFs in parallel
+        if verbose:
+            click.echo(f"📁 Generating {len(pdf_jobs)} PDFs...")
+        results = generate_pdfs_parallel(pdf_jobs, max_parallelism, pdf_backend)
+        for (_, output), success in zip(pdf_jobs, results):
+            if success:
+                click.echo(f"✨ Resume generated successfully: {output}")
+            else:
+                click.echo(f"❌ Failed to generate PDF: {output}", err=True)
+
+    except Exception as e:
+        click.echo(f"❌ Error: {e}", err=True)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # `generate_resume.py batch ...` tailors one profile to a directory of jobs
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        batch(sys.argv[2:], prog_name=f"{Path(sys.argv[0]).name} batch")
+    else:
+        main()
\ No newline at end of file